@@ -1,6 +1,6 @@
 import os
 from types import ModuleType
-from typing import Union
+from typing import Optional, Union
 import dill
 import pandas as pd
 from lightwood.api.types import DataAnalysis, JsonAI, ProblemDefinition
@@ -8,9 +8,8 @@ from lightwood.data import statistical_analysis
 from lightwood.data import infer_types
 from lightwood.api.predictor import PredictorInterface
 from lightwood.api.json_ai import generate_json_ai
-import tempfile
 from lightwood.api.json_ai import code_from_json_ai as _code_from_json_ai
-import importlib.util
+import linecache
 import sys
 import random
 import string
@@ -32,12 +31,14 @@ def load_custom_module(file_path: str):
     copyfile(file_path, custom_module_path)
 
 
-def predictor_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict]) -> PredictorInterface:
+def predictor_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict],
+                           data_analysis: Optional[DataAnalysis] = None) -> PredictorInterface:
     """
     Creates a ready-to-train ``Predictor`` object from some raw data and a ``ProblemDefinition``. Do not use this if you want to edit the JsonAI first. Usually you'd want to next train this predictor by calling the ``learn`` method on the same dataframe used to create it.
 
     :param df: The raw data
     :param problem_definition: The manual specifications for your predictive problem
+    :param data_analysis: An optional ``DataAnalysis`` previously obtained via ``analyze_dataset`` for this same dataframe and problem definition, to avoid inferring types and analyzing the data a second time
 
     :returns: A lightwood ``Predictor`` object
     """ # noqa
@@ -48,16 +49,18 @@ def predictor_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDe
         log.info(f'Dropping features: {problem_definition.ignore_features}')
         df = df.drop(columns=problem_definition.ignore_features)
 
-    predictor_class_str = code_from_problem(df, problem_definition)
+    predictor_class_str = code_from_problem(df, problem_definition, data_analysis)
     return predictor_from_code(predictor_class_str)
 
 
-def json_ai_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict]) -> JsonAI:
+def json_ai_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict],
+                         data_analysis: Optional[DataAnalysis] = None) -> JsonAI:
     """
     Creates a JsonAI from your raw data and problem definition. Usually you would use this when you want to subsequently edit the JsonAI, the easiest way to do this is to unload it to a dictionary via `to_dict`, modify it, and then create a new object from it using `lightwood.JsonAI.from_dict`. It's usually better to generate the JsonAI using this function rather than writing it from scratch.
 
     :param df: The raw data
     :param problem_definition: The manual specifications for your predictive problem
+    :param data_analysis: An optional ``DataAnalysis`` previously obtained via ``analyze_dataset`` for this same dataframe and problem definition, to avoid inferring types and analyzing the data a second time
 
     :returns: A ``JsonAI`` object generated based on your data and problem specifications
     """ # noqa
@@ -70,9 +73,13 @@ def json_ai_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefi
         log.info(f'Dropping features: {problem_definition.ignore_features}')
         df = df.drop(columns=problem_definition.ignore_features)
 
-    type_information = infer_types(df, problem_definition.pct_invalid)
-    stats = statistical_analysis(
-        df, type_information.dtypes, type_information.identifiers, problem_definition)
+    if data_analysis is not None:
+        type_information = data_analysis.type_information
+        stats = data_analysis.statistical_analysis
+    else:
+        type_information = infer_types(df, problem_definition.pct_invalid)
+        stats = statistical_analysis(
+            df, type_information.dtypes, type_information.identifiers, problem_definition)
 
     duration = time.time() - started
     if problem_definition.time_aim is not None:
@@ -101,28 +108,44 @@ def code_from_json_ai(json_ai: JsonAI) -> str:
     return _code_from_json_ai(json_ai)
 
 
+_module_cache = {}
+
+
 def predictor_from_code(code: str) -> PredictorInterface:
     """
     :param code: The ``Predictor``'s code in text form
 
     :returns: A lightwood ``Predictor`` object
     """
-    module_name = ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
-    module_name += str(time.time()).replace('.', '')
-    predictor = _module_from_code(code, module_name).Predictor()
+    module = _module_cache.get(code)
+    if module is None:
+        module_name = ''.join(random.choices(string.ascii_uppercase + string.digits, k=12))
+        module_name += str(time.time()).replace('.', '')
+        module = _module_from_code(code, module_name)
+        _module_cache[code] = module
+    predictor = module.Predictor()
     return predictor
 
 
-def analyze_dataset(df: pd.DataFrame) -> DataAnalysis:
+def analyze_dataset(df: pd.DataFrame,
+                    problem_definition: Union[ProblemDefinition, dict, None] = None) -> DataAnalysis:
     """
     You can use this to understand and visualize the data, it's not a part of the pipeline one would use for creating and training predictive models.
 
     :param df: The raw data
+    :param problem_definition: The specifications for your predictive problem. When provided, the resulting ``DataAnalysis`` can be fed back to ``predictor_from_problem`` / ``json_ai_from_problem`` to avoid analyzing the data twice; when omitted, the first column is assumed to be the target
 
     :returns: An object containing insights about the data (specifically the type information and statistical analysis)
     """ # noqa
 
-    problem_definition = ProblemDefinition.from_dict({'target': str(df.columns[0])})
+    if problem_definition is None:
+        problem_definition = ProblemDefinition.from_dict({'target': str(df.columns[0])})
+    elif not isinstance(problem_definition, ProblemDefinition):
+        problem_definition = ProblemDefinition.from_dict(problem_definition)
+
+    if problem_definition.ignore_features:
+        log.info(f'Dropping features: {problem_definition.ignore_features}')
+        df = df.drop(columns=problem_definition.ignore_features)
 
     type_information = infer_types(df, problem_definition.pct_invalid)
     stats = statistical_analysis(
@@ -134,13 +157,15 @@ def analyze_dataset(df: pd.DataFrame) -> DataAnalysis:
     )
 
 
-def code_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict]) -> str:
+def code_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinition, dict],
+                      data_analysis: Optional[DataAnalysis] = None) -> str:
     """
     :param df: The raw data
     :param problem_definition: The manual specifications for your predictive problem
+    :param data_analysis: An optional ``DataAnalysis`` previously obtained via ``analyze_dataset`` for this same dataframe and problem definition, to avoid inferring types and analyzing the data a second time
 
     :returns: The text code generated based on your data and problem specifications
-    """
+    """ # noqa
     if not isinstance(problem_definition, ProblemDefinition):
         problem_definition = ProblemDefinition.from_dict(problem_definition)
 
@@ -148,7 +173,7 @@ def code_from_problem(df: pd.DataFrame, problem_definition: Union[ProblemDefinit
         log.info(f'Dropping features: {problem_definition.ignore_features}')
         df = df.drop(columns=problem_definition.ignore_features)
 
-    json_ai = json_ai_from_problem(df, problem_definition)
+    json_ai = json_ai_from_problem(df, problem_definition, data_analysis)
     predictor_code = code_from_json_ai(json_ai)
     return predictor_code
 
@@ -185,25 +210,23 @@ def predictor_from_state(state_file: str, code: str = None) -> PredictorInterfac
 
 def _module_from_code(code: str, module_name: str) -> ModuleType:
     """
-    Create a python module (containing the generated ``Predictor`` class) from the code. This is both a python object and an associated temporary file on your filesystem
+    Create a python module (containing the generated ``Predictor`` class) from the code, compiled in memory
 
     :param code: The ``Predictor``'s code in text form
     :param module_name: The name of the newly created module
 
     :returns: A python module object
     """ # noqa
-    dirname = tempfile.gettempdir()
-    filename = os.urandom(24).hex() + str(time.time()).replace('.', '') + '.py'
-    path = os.path.join(dirname, filename)
     if 'LIGHTWOOD_DEV_SAVE_TO' in os.environ:
-        path = os.environ['LIGHTWOOD_DEV_SAVE_TO']
-
-    with open(path, 'wb') as fp:
-        fp.write(code.encode('utf-8'))
-        spec = importlib.util.spec_from_file_location(module_name, fp.name)
-        temp_module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = temp_module
-        spec.loader.exec_module(temp_module)
+        with open(os.environ['LIGHTWOOD_DEV_SAVE_TO'], 'wb') as fp:
+            fp.write(code.encode('utf-8'))
+
+    # register the source so tracebacks from the generated code still show their lines
+    linecache.cache[module_name] = (len(code), None, code.splitlines(keepends=True), module_name)
+
+    temp_module = ModuleType(module_name)
+    sys.modules[module_name] = temp_module
+    exec(compile(code, module_name, 'exec'), temp_module.__dict__)
 
     return temp_module
 
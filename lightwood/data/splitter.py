@@ -1,5 +1,5 @@
 from typing import List, Dict
-from itertools import product
+from math import isclose
 
 import numpy as np
 import pandas as pd
@@ -36,13 +36,13 @@ def splitter(
     :returns: A dictionary containing the keys train, test and dev with their respective data frames, as well as the "stratified_on" key indicating which columns the data was stratified on (None if it wasn't stratified on anything)
     """  # noqa
     pct_sum = pct_train + pct_dev + pct_test
-    if not (np.isclose(pct_sum, 1, atol=0.001) and np.less(pct_sum, 1 + 1e-5)):
+    if not (isclose(pct_sum, 1, abs_tol=1e-3) and pct_sum < 1 + 1e-5):
         raise Exception(f'The train, dev and test percentage of the data needs to sum up to 1 (got {pct_sum})')
 
-    # Shuffle the data
+    # Shuffle the data (only the splits get a fresh index, to spare a copy of the full frame)
     np.random.seed(seed)
     if not tss.is_timeseries:
-        data = data.sample(frac=1, random_state=seed).reset_index(drop=True)
+        data = data.take(np.random.permutation(data.shape[0]))
 
     # Check if stratification should be done
     stratify_on = []
@@ -58,6 +58,8 @@ def splitter(
         train, dev, test = stratify(data, pct_train, pct_dev, pct_test, stratify_on, seed, reshuffle)
     else:
         train, dev, test = simple_split(data, pct_train, pct_dev, pct_test)
+        if not tss.is_timeseries:
+            train, dev, test = [df.reset_index(drop=True) for df in (train, dev, test)]
 
     return {"train": train, "test": test, "dev": dev, "stratified_on": stratify_on}
 
@@ -115,36 +117,57 @@ def stratify(data: pd.DataFrame,
     :returns Stratified train, dev, test dataframes
     """  # noqa
 
-    train_st = pd.DataFrame(columns=data.columns)
-    dev_st = pd.DataFrame(columns=data.columns)
-    test_st = pd.DataFrame(columns=data.columns)
-
-    all_group_combinations = list(product(*[data[col].unique() for col in stratify_on]))
-    for group in all_group_combinations:
-        df = data
-        for idx, col in enumerate(stratify_on):
-            df = df[df[col] == group[idx]]
+    # Encode every stratification column to integer codes and pack them into a single int64 key,
+    # so grouping costs one integer sort instead of hashing (possibly multi-column) raw values.
+    # A stable sort on the key leaves each group as a contiguous run in within-group shuffle order.
+    codes = [pd.factorize(data[col])[0].astype(np.int64) for col in stratify_on]
+    key = codes[0]
+    valid = key >= 0  # factorize marks missing keys with -1; such rows are never stratified
+    for col_codes in codes[1:]:
+        valid &= col_codes >= 0
+        multiplier = int(col_codes.max()) + 2 if len(col_codes) else 2
+        if len(key) and (int(key.max()) + 2) * multiplier >= np.iinfo(np.int64).max:
+            key = pd.factorize(key)[0]  # densify to keep the packed key within int64 range
+        key = key * multiplier + col_codes
+
+    # Build per-group position tables in one pass: a stable argsort gathers each group's rows,
+    # and bincount + cumsum give the offset range of every group within the sorted order
+    positions = np.flatnonzero(valid)
+    group_codes = key[positions] if len(stratify_on) == 1 else pd.factorize(key[positions])[0]
+    sorted_positions = positions[np.argsort(group_codes, kind='stable')]
+    counts = np.bincount(group_codes)
+    offsets = np.concatenate(([0], np.cumsum(counts)))
+
+    # Per-group split boundaries follow from the count table alone (slicing clamps at the group
+    # size, hence the minimum), so conformity to the requested percentages can be checked before
+    # moving any data: small or skewed groups that would force a revert skip the stratified
+    # gather entirely.
+    train_ends = np.minimum(np.rint(counts * pct_train).astype(np.int64), counts)
+    dev_ends = np.minimum(train_ends + np.rint(counts * pct_dev).astype(np.int64), counts)
+    test_ends = np.minimum(dev_ends + np.rint(counts * pct_test).astype(np.int64), counts)
+
+    lengths = np.array([train_ends.sum(), (dev_ends - train_ends).sum(), (test_ends - dev_ends).sum()])
+    emp_tr, emp_dev, emp_te = lengths / len(data)
+    if not np.isclose((emp_tr, emp_dev, emp_te), (pct_train, pct_dev, pct_test), atol=atol).all():
+        log.warning(f"Stratification is outside of imposed tolerance ({atol}) ({emp_tr} train - {emp_dev} dev - {emp_te} test), reverting to a simple split.")  # noqa
+        splits = simple_split(data, pct_train, pct_dev, pct_test)
+        return [df.reset_index(drop=True) for df in splits] if reshuffle else splits
 
-        train_cutoff = round(df.shape[0] * pct_train)
-        dev_cutoff = round(df.shape[0] * pct_dev) + train_cutoff
-        test_cutoff = round(df.shape[0] * pct_test) + dev_cutoff
+    # Assign all groups at once: each row's rank within its group (a cumcount over the sorted
+    # order) is compared against its group's cutoffs, so no per-group loop is needed and each
+    # output frame is materialized with a single take
+    ranks = np.arange(len(sorted_positions)) - np.repeat(offsets[:-1], counts)
+    row_train_end = np.repeat(train_ends, counts)
+    row_dev_end = np.repeat(dev_ends, counts)
+    row_test_end = np.repeat(test_ends, counts)
 
-        train_st = train_st.append(df[:train_cutoff])
-        dev_st = dev_st.append(df[train_cutoff:dev_cutoff])
-        test_st = test_st.append(df[dev_cutoff:test_cutoff])
+    train_st = data.take(sorted_positions[ranks < row_train_end])
+    dev_st = data.take(sorted_positions[(ranks >= row_train_end) & (ranks < row_dev_end)])
+    test_st = data.take(sorted_positions[(ranks >= row_dev_end) & (ranks < row_test_end)])
 
     if reshuffle:
-        train_st, dev_st, test_st = [df.sample(frac=1, random_state=seed).reset_index(drop=True)
+        np.random.seed(seed)
+        train_st, dev_st, test_st = [df.take(np.random.permutation(df.shape[0])).reset_index(drop=True)
                                      for df in [train_st, dev_st, test_st]]
 
-    # check that stratified lengths conform to expected percentages
-    emp_tr = len(train_st) / len(data)
-    emp_dev = len(dev_st) / len(data)
-    emp_te = len(test_st) / len(data)
-    if not np.isclose(emp_tr, pct_train, atol=atol) or \
-            not np.isclose(emp_dev, pct_dev, atol=atol) or \
-            not np.isclose(emp_te, pct_test, atol=atol):
-        log.warning(f"Stratification is outside of imposed tolerance ({atol}) ({emp_tr} train - {emp_dev} dev - {emp_te} test), reverting to a simple split.")  # noqa
-        train_st, dev_st, test_st = simple_split(data, pct_train, pct_dev, pct_test)
-
     return [train_st, dev_st, test_st]
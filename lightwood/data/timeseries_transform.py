@@ -77,7 +77,7 @@ def transform_timeseries(
                                              periods=len(subset))
                 subset['__mdb_inferred_freq'] = subset.index.freq   # sets constant column because pd.concat forgets freq (see: https://github.com/pandas-dev/pandas/issues/3232)  # noqa
                 subsets.append(subset)
-    original_df = pd.concat(subsets).sort_values(by='__mdb_original_index')
+    original_df = pd.concat(subsets, copy=False).sort_values(by='__mdb_original_index')
 
     if '__mdb_forecast_offset' in original_df.columns:
         """ This special column can be either None or an integer. If this column is passed, then the TS transformation will react to the values within:
@@ -173,7 +173,7 @@ def transform_timeseries(
             if tss.use_previous_target:
                 df_arr[i] = _ts_add_previous_target(df_arr[i], target=target, window=tss.window)
 
-    combined_df = pd.concat(df_arr)
+    combined_df = pd.concat(df_arr, copy=False)
 
     if '__mdb_forecast_offset' in combined_df.columns:
         combined_df = pd.DataFrame(combined_df[combined_df['__make_predictions']])  # filters by True only